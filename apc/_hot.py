@@ -0,0 +1,19 @@
+import numpy as np
+
+def shift_arrays(data_u8: np.ndarray, header_offsets: np.ndarray, starts: np.ndarray, ends: np.ndarray, rel_starts: np.ndarray, thresholds: np.ndarray, deltas: np.ndarray) -> None:
+  # thresholds must be sorted ascending; each array whose start is at or past
+  # a threshold accumulates that threshold's delta, all at C speed in ufuncs
+  cum_deltas = np.cumsum(deltas)
+  shift_idx = np.searchsorted(thresholds, starts, side="right")
+  applied = np.where(shift_idx > 0, cum_deltas[shift_idx - 1], 0)
+  applied = np.where(starts != 0, applied, 0)
+  starts += applied
+  ends += applied
+  rel_starts += applied
+  changed = np.flatnonzero(applied)
+  offsets = header_offsets[changed]
+  values = rel_starts[changed]
+  data_u8[offsets] = values & 0xFF
+  data_u8[offsets+1] = (values >> 8) & 0xFF
+  data_u8[offsets+2] = (values >> 16) & 0xFF
+  data_u8[offsets+3] = (values >> 24) & 0xFF
@@ -1,13 +1,21 @@
-import zlib, contextlib, random, math, struct
+import zlib, contextlib, heapq, io, operator, random, math, struct
 from deca.file import ArchiveFile
 from deca.ff_adf import Adf
 from pathlib import Path
+import numpy as np
 from apc import config
+from apc._hot import shift_arrays
 from apc.adf_profile import *
 
 class FileNotFound(Exception):
     pass
 
+_COMPRESS_LEVEL = 1
+_U32 = struct.Struct("<I")
+_ADF_CACHE = {}
+_BY_ARRAY_START = operator.attrgetter("array_start_offset")
+_CREATED_DIRS = set()
+
 class DecompressedAdfFile():
     def __init__(self, basename: str, filename: Path, file_header: bytearray, header: bytearray, data: bytearray) -> None:
         self.basename = basename
@@ -18,19 +26,21 @@ class DecompressedAdfFile():
         self.org_size = len(header + data)
 
     def save(self, destination: Path, verbose = False) -> None:        
-        decompressed_data_bytes = self.header + self.data
-        new_size = len(decompressed_data_bytes)
+        new_size = len(self.header) + len(self.data)
         if self.org_size != new_size:
           print("Org:", self.org_size, "New:", new_size)
           decompressed_size = struct.pack("I", new_size)
           self.file_header[8:12] = decompressed_size
           self.file_header[24:28] = decompressed_size
-        commpressed_data_bytes = self.file_header + _compress_bytes(decompressed_data_bytes)
+        compressor = zlib.compressobj(_COMPRESS_LEVEL)
+        file_parts = [self.file_header, compressor.compress(self.header), compressor.compress(self.data), compressor.flush()]
 
         adf_file = destination / self.basename
         if verbose:
             print(f"Saving modded file to {adf_file}")
-        _save_file(adf_file, commpressed_data_bytes, verbose=verbose)  
+        _save_file_parts(adf_file, file_parts, verbose=verbose)
+        for cache_key in [x for x in _ADF_CACHE if x[0] == str(adf_file)]:
+            del _ADF_CACHE[cache_key]
 
 class ParsedAdfFile():
     def __init__(self, decompressed: DecompressedAdfFile, adf: Adf) -> None:
@@ -51,56 +61,62 @@ def _read_file(filename: Path, verbose = False):
         print(f"Reading {filename}")
     return filename.read_bytes()
 
-def _decompress_bytes(data_bytes: bytearray) -> bytearray:
-    decompress = zlib.decompressobj()
-    decompressed = decompress.decompress(data_bytes)
-    decompressed = decompressed + decompress.flush()
-    return decompressed
+def _decompress_bytes(data_bytes) -> bytes:
+    return zlib.decompress(data_bytes)
 
-def _compress_bytes(data_bytes: bytearray) -> bytearray:
-    compress = zlib.compressobj()
-    compressed = compress.compress(data_bytes)
-    compressed = compressed + compress.flush()
-    return compressed
+def _ensure_parent_dir(filename: Path) -> None:
+    parent = filename.parent
+    if parent not in _CREATED_DIRS:
+        parent.mkdir(exist_ok=True)
+        _CREATED_DIRS.add(parent)
 
 def _save_file(filename: Path, data_bytes: bytearray, verbose = False):
-    Path(filename.parent).mkdir(exist_ok=True)
+    _ensure_parent_dir(filename)
     filename.write_bytes(data_bytes)
     if verbose:
         print(f"Saved {filename}")
 
-def _parse_adf_file(filename: Path, suffix: str = None, verbose = False) -> Adf:
+def _save_file_parts(filename: Path, parts: List[bytes], verbose = False):
+    _ensure_parent_dir(filename)
+    with open(filename, "wb") as f:
+        f.writelines(parts)
+    if verbose:
+        print(f"Saved {filename}")
+
+def _parse_adf_data(data_bytes: bytearray, basename: str, suffix: str = None, verbose = False) -> Adf:
     obj = Adf()
-    with ArchiveFile(open(filename, 'rb')) as f:
+    with ArchiveFile(io.BytesIO(data_bytes)) as f:
         with contextlib.redirect_stdout(None):
             obj.deserialize(f)
-    content = obj.dump_to_string()
-    suffix = f"_{suffix}.txt" if suffix else ".txt"
-    txt_filename = config.APP_DIR_PATH / f".working/{filename.name}{suffix}"
-    _save_file(txt_filename, bytearray(content, 'utf-8'), verbose)            
+    if verbose:
+        content = obj.dump_to_string()
+        suffix = f"_{suffix}.txt" if suffix else ".txt"
+        txt_filename = config.APP_DIR_PATH / f".working/{basename}{suffix}"
+        _save_file(txt_filename, bytearray(content, 'utf-8'), verbose)
     return obj
 
+def _parse_adf_file(filename: Path, suffix: str = None, verbose = False) -> Adf:
+    return _parse_adf_data(bytearray(filename.read_bytes()), filename.name, suffix, verbose=verbose)
+
 def _decompress_adf_file(filename: Path, verbose = False) -> DecompressedAdfFile:
     # read entire adf file
-    data_bytes = _read_file(filename, verbose)
-    data_bytes = bytearray(data_bytes)
+    raw_bytes = _read_file(filename, verbose)
 
     # split out header
-    header = data_bytes[0:32]
-    data_bytes = data_bytes[32:]
+    header = bytearray(raw_bytes[0:32])
 
-    # decompress data
-    decompressed_data_bytes = _decompress_bytes(data_bytes)
-    decompressed_data_bytes = bytearray(decompressed_data_bytes)
+    # decompress data without copying the compressed tail
+    decompressed = _decompress_bytes(memoryview(raw_bytes)[32:])
 
-    # split out compression header
-    decompressed_header = decompressed_data_bytes[0:5]
-    decompressed_data_bytes = decompressed_data_bytes[5:]
+    # split out compression header; one copy into the mutable buffer
+    decompressed_header = bytearray(decompressed[0:5])
+    decompressed_data_bytes = bytearray(decompressed[5:])
 
-    # save uncompressed adf data to file
+    # only persist the uncompressed adf data when debugging
     parsed_basename = filename.name
     adf_file = config.APP_DIR_PATH / f".working/{parsed_basename}_sliced"
-    _save_file(adf_file, decompressed_data_bytes, verbose)
+    if verbose:
+        _save_file(adf_file, decompressed_data_bytes, verbose)
 
     return DecompressedAdfFile(
         parsed_basename,
@@ -118,30 +134,37 @@ def _update_non_instance_offsets(data: bytearray, profile: dict, added_size: int
     (profile["header_total_size_offset"], profile["total_size"]),
     (profile["instance_header_start"]+12, profile["details"]["instance_offsets"]["instances"][0]["size"])
   ]
+  pack_into = _U32.pack_into
   for offset in offsets_to_update:
-    write_value(data, create_u32(offset[1] + added_size), offset[0])
+    pack_into(data, offset[0], offset[1] + added_size)
 
-def _insert_animal(data: bytearray, animal: Animal, array: AdfArray) -> None:
-  write_value(data, create_u32(read_u32(data[array.header_length_offset:array.header_length_offset+4])+1), array.header_length_offset)
-  animal_bytes = animal.to_bytes()
+def _insert_animal(data: bytearray, animal_bytes: bytearray, array: AdfArray) -> None:
+  _U32.pack_into(data, array.header_length_offset, _U32.unpack_from(data, array.header_length_offset)[0] + 1)
   data[array.array_org_end_offset:array.array_org_end_offset] = animal_bytes
 
-def _remove_animal(data: bytearray, array: AdfArray, index: int) -> None:
-  write_value(data, create_u32(read_u32(data[array.header_length_offset:array.header_length_offset+4])-1), array.header_length_offset)
-  index_offset = array.array_org_start_offset + index * 32
-  del data[index_offset:index_offset+32]
-
-def _update_instance_arrays(data: bytearray, animal_arrays: List[AdfArray], target_array: AdfArray, size: int):
-  arrays_modded = []
-  for animal_array in animal_arrays:    
-    if animal_array.array_start_offset >= target_array.array_end_offset and animal_array.array_start_offset != 0:
-      arrays_modded.append(animal_array)
-      animal_array.array_start_offset = animal_array.array_start_offset + size
-      animal_array.array_end_offset = animal_array.array_end_offset + size
-      animal_array.rel_array_start_offset = animal_array.rel_array_start_offset + size
-      write_value(data, create_u32(animal_array.rel_array_start_offset), animal_array.header_array_offset)
-    # if animal_array.header_start_offset >= target_array.array_end_offset:
-    #   print(animal_array)
+def _remove_animals_bulk(data: bytearray, array: AdfArray, indices: List[int]) -> None:
+  _U32.pack_into(data, array.header_length_offset, _U32.unpack_from(data, array.header_length_offset)[0] - len(indices))
+  removal_starts = sorted(array.array_org_start_offset + index * 32 for index in indices)
+  surviving = bytearray(len(data) - removal_starts[0] - 32 * len(removal_starts))
+  source = memoryview(data)
+  write_offset = 0
+  for removal_i, removal_start in enumerate(removal_starts):
+    segment_start = removal_start + 32
+    segment_end = removal_starts[removal_i+1] if removal_i + 1 < len(removal_starts) else len(data)
+    segment_size = segment_end - segment_start
+    surviving[write_offset:write_offset+segment_size] = source[segment_start:segment_end]
+    write_offset += segment_size
+  source.release()
+  data[removal_starts[0]:] = surviving
+
+def _apply_shifts(data: bytearray, arrays_soa: AdfArraysSoA, shifts: List[Tuple[int, int]]) -> None:
+  if len(shifts) == 0:
+    return
+  shifts = sorted(shifts)
+  thresholds = np.array([x[0] for x in shifts], dtype=np.int64)
+  deltas = np.array([x[1] for x in shifts], dtype=np.int64)
+  shift_arrays(np.frombuffer(data, dtype=np.uint8), arrays_soa.header_array_offsets, arrays_soa.array_start_offsets, arrays_soa.array_end_offsets, arrays_soa.rel_array_start_offsets, thresholds, deltas)
+  arrays_soa.writeback()
 
 def parse_adf(filename: Path, suffix: str = None, verbose = False) -> Adf:
     if verbose:
@@ -149,8 +172,14 @@ def parse_adf(filename: Path, suffix: str = None, verbose = False) -> Adf:
     return _parse_adf_file(filename, suffix, verbose=verbose)
 
 def load_adf(filename: Path, verbose = False) -> ParsedAdfFile:
+    stat = filename.stat()
+    cache_key = (str(filename), stat.st_mtime_ns, stat.st_size)
     data = _decompress_adf_file(filename, verbose=verbose)
-    adf = parse_adf(data.filename, verbose=verbose)
+    adf = _ADF_CACHE.get(cache_key)
+    if adf is None:
+        if verbose:
+            print(f"Parsing {data.basename}")
+        adf = _ADF_CACHE[cache_key] = _parse_adf_data(data.data, data.basename, verbose=verbose)
     return ParsedAdfFile(data, adf)
 
 def load_reserve(reserve_name: str, mod: bool = False, verbose = False) -> ParsedAdfFile:
@@ -164,25 +193,30 @@ def add_animals_to_reserve(reserve_name: str, species_key: str, animals: List[An
   org_filename = _get_file_name(reserve_name, mod)
   decompressed_adf = _decompress_adf_file(org_filename, verbose=True)
   reserve_data = decompressed_adf.data
-  profile = create_profile(decompressed_adf.filename)
-  population_index = config.RESERVES[reserve_name]["species"].index(species_key)  
-  animal_arrays, other_arrays = find_arrays(profile, reserve_data)
-  all_arrays = animal_arrays+other_arrays
-  eligible_animal_arrays = [x for x in animal_arrays if x.population == population_index]
-  eligible_animal_arrays = sorted(eligible_animal_arrays, key=lambda x: x.array_start_offset, reverse=True)
+  profile = create_profile(reserve_data)
+  population_index = config.get_species_index(reserve_name, species_key)
+  animal_arrays, other_arrays, all_arrays_soa = find_arrays(profile, reserve_data)
+  eligible_animal_arrays = heapq.nlargest(len(animals), (x for x in animal_arrays if x.population == population_index), key=_BY_ARRAY_START)
   
   total_size = animals[0].size * len(animals)
   _update_non_instance_offsets(reserve_data, profile, total_size)
   n = 1 if len(animals) < len(eligible_animal_arrays) else math.ceil(len(animals) / len(eligible_animal_arrays))
-  animal_chunks = [animals[i:i + n] for i in range(0, len(animals), n)]
-  for i, animal_chunk in enumerate(animal_chunks):
-    chosen_array = eligible_animal_arrays[i]
-    for animal in animal_chunk:
-      _update_instance_arrays(reserve_data, all_arrays, chosen_array, animal.size)
-  for i, animal_chunk in enumerate(animal_chunks):
-    chosen_array = eligible_animal_arrays[i]    
-    for animal in animal_chunk:
-      _insert_animal(reserve_data, animal, chosen_array)
+  last_array_i = len(eligible_animal_arrays) - 1
+  array_of = [min(animal_i // n, last_array_i) for animal_i in range(len(animals))]
+  array_deltas = [0] * len(eligible_animal_arrays)
+  for animal, array_i in zip(animals, array_of):
+    array_deltas[array_i] += animal.size
+  shifts = [(eligible_animal_arrays[array_i].array_end_offset, delta) for array_i, delta in enumerate(array_deltas) if delta > 0]
+  _apply_shifts(reserve_data, all_arrays_soa, shifts)
+  bytes_cache = {}
+  cached_bytes = bytes_cache.get
+  insert_animal = _insert_animal
+  for animal, array_i in zip(animals, array_of):
+    signature = animal.signature()
+    animal_bytes = cached_bytes(signature)
+    if animal_bytes is None:
+      animal_bytes = bytes_cache[signature] = animal.to_bytes()
+    insert_animal(reserve_data, animal_bytes, eligible_animal_arrays[array_i])
   decompressed_adf.save(config.MOD_DIR_PATH, verbose=True)
 
 def remove_animals_from_reserve(reserve_name: str, species_key: str, animal_cnt: int, gender: str, verbose: bool, mod: bool) -> None:
@@ -191,13 +225,12 @@ def remove_animals_from_reserve(reserve_name: str, species_key: str, animal_cnt:
     return
   org_filename = _get_file_name(reserve_name, mod)
   decompressed_adf = _decompress_adf_file(org_filename, verbose=verbose)
-  profile = create_profile(decompressed_adf.filename)
-  reserve_data = decompressed_adf.data 
-  animal_arrays, other_arrays = find_arrays(profile, reserve_data)
-  all_arrays = animal_arrays+other_arrays
-  population_index = config.RESERVES[reserve_name]["species"].index(species_key)
+  reserve_data = decompressed_adf.data
+  profile = create_profile(reserve_data)
+  animal_arrays, other_arrays, all_arrays_soa = find_arrays(profile, reserve_data)
+  population_index = config.get_species_index(reserve_name, species_key)
   eligible_animal_arrays = [x for x in animal_arrays if x.population == population_index and ((x.male_cnt > 0 and gender == "male") or (x.female_cnt > 0 and gender == "female"))]
-  eligible_animal_arrays = sorted(eligible_animal_arrays, key=lambda x: x.array_start_offset, reverse=True)
+  eligible_animal_arrays = sorted(eligible_animal_arrays, key=_BY_ARRAY_START, reverse=True)
   animal_size = 32
   
   animals_left_to_remove = animal_cnt
@@ -221,13 +254,10 @@ def remove_animals_from_reserve(reserve_name: str, species_key: str, animal_cnt:
       
   total_size = animal_size * animal_cnt
   _update_non_instance_offsets(reserve_data, profile, -total_size)
-  for remove_cnt, animal_array in arrays_to_remove_from:
-    _update_instance_arrays(reserve_data, all_arrays, animal_array, -(animal_size*remove_cnt))
+  shifts = [(animal_array.array_end_offset, -(animal_size*remove_cnt)) for remove_cnt, animal_array in arrays_to_remove_from]
+  _apply_shifts(reserve_data, all_arrays_soa, shifts)
   for remove_cnt, animal_array in arrays_to_remove_from:
     remove_indices = animal_array.male_indices if gender == "male" else animal_array.female_indices
-    removed_cnt = 0
-    while removed_cnt < remove_cnt:      
-      _remove_animal(reserve_data, animal_array, remove_indices[remove_cnt-removed_cnt])
-      removed_cnt += 1
+    _remove_animals_bulk(reserve_data, animal_array, remove_indices[1:remove_cnt+1])
   
   decompressed_adf.save(config.MOD_DIR_PATH, verbose=verbose)
\ No newline at end of file
@@ -1,4 +1,5 @@
 import struct, json, re
+import numpy as np
 from pathlib import Path
 from typing import Tuple, List
 
@@ -18,6 +19,7 @@ PRIMITIVE_2 = [typedef_s16, typedef_u16]
 PRIMITIVE_8 = [typedef_s64, typedef_u64, typedef_f64]
 STRUCTURE = 1
 ARRAY = 3
+_U32 = struct.Struct("<I")
 
 class AdfArray:
   def __init__(self, name: str, population: int, group: int, length: int, header_start_offset: int, header_length_offset: int, header_array_offset: int, array_start_offset: int, array_end_offset: int, rel_array_start_offset: int, rel_array_end_offset: int, male_indices: List[int], female_indices: List[int]) -> None:
@@ -42,6 +44,20 @@ class AdfArray:
   def __repr__(self) -> str:
     return f"{self.name} ; Header Offset: {self.header_start_offset},{hex(self.header_start_offset)}; Data Offset: {self.array_start_offset},{hex(self.array_start_offset)}"
 
+class AdfArraysSoA:
+  def __init__(self, arrays: List[AdfArray]) -> None:
+    self.arrays = sorted(arrays, key=lambda x: x.array_start_offset)
+    self.array_start_offsets = np.array([x.array_start_offset for x in self.arrays], dtype=np.int64)
+    self.array_end_offsets = np.array([x.array_end_offset for x in self.arrays], dtype=np.int64)
+    self.rel_array_start_offsets = np.array([x.rel_array_start_offset for x in self.arrays], dtype=np.int64)
+    self.header_array_offsets = np.array([x.header_array_offset for x in self.arrays], dtype=np.int64)
+
+  def writeback(self) -> None:
+    for i, array in enumerate(self.arrays):
+      array.array_start_offset = int(self.array_start_offsets[i])
+      array.array_end_offset = int(self.array_end_offsets[i])
+      array.rel_array_start_offset = int(self.rel_array_start_offsets[i])
+
 class Animal:
   def __init__(self, gender: str, weight: float, score: float, is_great_one: bool, visual_variation_seed: int) -> None:
     self.gender = 1 if gender == "male" else 2
@@ -66,6 +82,9 @@ class Animal:
       y: {self.map_position_y},{create_f32(self.map_position_y)}
     """
     
+  def signature(self) -> tuple:
+    return (self.gender, self.weight, self.score, self.is_great_one, self.visual_variation_seed, self.id, self.map_position_x, self.map_position_y)
+
   def to_bytes(self) -> bytearray:
     gender = create_u8(self.gender)
     weight = create_f32(self.weight)
@@ -334,13 +353,15 @@ def find_population_array_offsets(offsets: dict, result: List[dict] = [], org_pa
 def parse_gender_cnt(data: bytearray, length: int, data_offset: int) -> dict:
   male_indices = []
   female_indices = []
+  male_append = male_indices.append
+  female_append = female_indices.append
+  unpack_from = _U32.unpack_from
   for i in range(length):
-    animal_offset = data_offset+i*32
-    gender = read_u32(data[animal_offset:animal_offset+4])
+    gender = unpack_from(data, data_offset+i*32)[0]
     if gender == 1:
-      male_indices.append(i)
+      male_append(i)
     else:
-      female_indices.append(i)
+      female_append(i)
   return (male_indices, female_indices)
 
 def create_array(offset: dict, instance_offset: int, data: bytearray = None, population: int = 0, group: int = 0) -> AdfArray:
@@ -400,8 +421,7 @@ def profile_header(data: bytearray) -> dict:
     "header_end": 64
   }  
 
-def create_profile(filename: Path) -> None:
-  data = bytearray(filename.read_bytes())
+def create_profile(data: bytearray) -> dict:
   header_profile = profile_header(data)
   instance_count = header_profile["instance_count"]
   instance_offset = header_profile["instance_offset"]
@@ -441,10 +461,10 @@ def create_profile(filename: Path) -> None:
     }
   }
   
-def find_arrays(profile: dict, data: bytearray) -> Tuple[List[AdfArray], List[AdfArray]]:
+def find_arrays(profile: dict, data: bytearray) -> Tuple[List[AdfArray], List[AdfArray], AdfArraysSoA]:
   instance_offsets = profile["details"]["instance_offsets"]
   instance_offset = instance_offsets["instances"][0]["offset"][0]
   array_offsets = find_population_array_offsets(instance_offsets["instances"][0]["0"], [])
   animal_arrays = [create_animal_array(x, instance_offset, data) for x in array_offsets if x["key"] == 'Animals']
   other_arrays = [create_array(x, instance_offset) for x in array_offsets if x["key"] != 'Animals']
-  return (animal_arrays, other_arrays)
+  return (animal_arrays, other_arrays, AdfArraysSoA(animal_arrays + other_arrays))
@@ -314,6 +314,7 @@ RESERVE_NAMES = json.load((CONFIG_PATH / "reserve_names.json").open())["reserve_
 FUR_NAMES = json.load((CONFIG_PATH / "fur_names.json").open())["fur_names"]
 RESERVES = json.load((CONFIG_PATH / "reserve_details.json").open())
 ANIMALS = json.load((CONFIG_PATH / "animal_details.json").open())
+_SPECIES_INDEX = { reserve_key: { species_key: species_i for species_i, species_key in enumerate(details["species"]) } for reserve_key, details in RESERVES.items() }
 # TODO: diamonds that can be both genders need different weight / score values
 # TODO: kangaroos with multiple white furs
 # TODO: crocodiles with multiple spots
@@ -497,6 +498,9 @@ def get_animal_fur_by_seed(species: str, gender: str, seed: int, is_go: bool = F
   else:
     return "-"
 
+def get_species_index(reserve_key: str, species_key: str) -> int:
+  return _SPECIES_INDEX[reserve_key][species_key]
+
 def valid_species_for_reserve(species: str, reserve: str) -> bool:
   return reserve in RESERVES and species in RESERVES[reserve]["species"]
 
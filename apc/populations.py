@@ -37,8 +37,7 @@ class NoAnimalsException(Exception):
   pass
       
 def _species(reserve_name: str, reserve_details: Adf, species: str) -> list:
-   reserve = config.RESERVES[reserve_name]
-   species_index = reserve["species"].index(species)
+   species_index = config.get_species_index(reserve_name, species)
    populations = _get_populations(reserve_details)
    return populations[species_index]
 
@@ -100,7 +99,7 @@ def find_animals(species: str, modded = False, good = False, verbose = False, to
 
 def describe_animals(reserve_name: str, species: str, reserve_details: Adf, good = False, verbose = False, top: bool = False) -> list:
     populations = _get_populations(reserve_details)
-    population = populations[get_reserve(reserve_name)["species"].index(species)]
+    population = populations[config.get_species_index(reserve_name, species)]
     groups = population.value["Groups"].value
     
     if verbose:
@@ -226,6 +225,24 @@ def describe_reserve(reserve_key: str, reserve_details: Adf, include_species = T
 
     return (sorted(rows, key = lambda x: x[1]), species_groups)
 
+def format_reserve_description(reserve_description: List[list]) -> List[list]:
+  rows = []
+  append = rows.append
+  for row in reserve_description:
+    diamond_cnt = row[8]
+    go_cnt = row[9]
+    append([
+      row[2],
+      row[3],
+      row[4],
+      row[5],
+      row[6],
+      row[7],
+      f"* {diamond_cnt}" if diamond_cnt > 0 else str(diamond_cnt),
+      f"** {go_cnt}" if go_cnt > 0 else str(go_cnt)
+    ])
+  return rows
+
 def _create_new_animal(animals: List[AdfAnimal]) -> adf_profile.Animal:
   chosen_animal = random.choice(animals)
   seed = random.uniform(0.000001, 0.099999)
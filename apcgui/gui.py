@@ -1,5 +1,5 @@
 import PySimpleGUI as sg
-import sys, traceback, time, os, re, shutil, subprocess, textwrap
+import sys, traceback, os, re, shutil, subprocess, textwrap
 from apc import populations, adf, config
 from apc.config import valid_go_species, Strategy, MOD_DIR_PATH, save_path, get_save_path, get_population_file_name, get_population_name, BACKUP_DIR_PATH, valid_fur_species, format_key, get_reserve_species, get_diamond_gender, get_species_name
 from apcgui import __version__, logo, config
@@ -10,7 +10,6 @@ DEFAULT_FONT = "_ 14"
 MEDIUM_FONT = "_ 13"
 BUTTON_FONT = "_ 13"
 SMALL_FONT = "_ 11"
-PROGRESS_DELAY = 0.3
 VIEW_MODDED=None
 VIEW_MOD_LOADED=None
 
@@ -19,6 +18,7 @@ SPECIES_COLUMNS = None
 
 reserve_keys = config.reserve_keys()
 reserve_names = None
+reserve_key_by_name = None
 reserve_name_size = None
 save_path_value = get_save_path()
 reserve_description = None
@@ -135,20 +135,6 @@ def _show_import_popup(reserve: str, file: str) -> str:
   window.close()
   return response
 
-def _highlight_values(data: list) -> list:
-  diamond_index = 6
-  go_index = 7
-  for row in data:
-    if row[diamond_index] > 0:
-      row[diamond_index] = f"* {row[diamond_index]}"
-    else:
-      row[diamond_index] = str(row[diamond_index])
-    if row[go_index] > 0:
-      row[go_index] = f"** {row[go_index]}"
-    else:
-      row[go_index] = str(row[go_index])      
-  return data
-
 def _disable_diamonds(window: sg.Window, disabled: bool) -> None:
   window["diamond_value"].update(disabled = disabled)
   window["gender_value"].update(disabled = disabled)
@@ -185,7 +171,7 @@ def _disable_go_parties(window: sg.Window, reserve_key: str) -> None:
   window["go_party"].update(disabled=(not found))
     
 def _reserve_key_from_name(name: str) -> str:
-  return reserve_keys[reserve_names.index(name)]
+  return reserve_key_by_name[name]
 
 def _show_species_description(window: sg.Window, reserve_key: str, species_name: str, is_modded: bool, is_top: bool) -> None:
   is_loaded_mod = _is_reserve_mod_loaded(reserve_key, window)
@@ -264,13 +250,11 @@ def _mod_furs(window: sg.Window, reserve_key: str, species_key: str, male_fur_ke
   except Exception as ex:
     _show_error(window, ex)
     return
-  window["progress"].update(25)
   try:
    populations.mod_furs(reserve_key, reserve_details, species_key, male_fur_keys, female_fur_keys, male_fur_cnt, female_fur_cnt)
   except Exception as ex:    
     _show_error(window, ex)
     return
-  window["progress"].update(75)
   window["reserve_warning"].update(VIEW_MODDED)
   window["fur_update_animals"].update(disabled = True)
   window["show_animals"].update(disabled=True)
@@ -279,7 +263,6 @@ def _mod_furs(window: sg.Window, reserve_key: str, species_key: str, male_fur_ke
   window["reserve_note"].update(f"{get_species_name(species_key).upper()} (Update Furs) {config.SAVED}: \"{MOD_DIR_PATH / get_population_file_name(reserve_key)}\"")
   window["reserve_description"].update(select_rows = [])
   window["progress"].update(100)
-  time.sleep(PROGRESS_DELAY)
   window["progress"].update(0)
   _reset_furs(window)
   _clear_furs(window)
@@ -293,19 +276,15 @@ def _mod_diamonds(window: sg.Window, reserve_key: str, species_key: str, diamond
   except Exception as ex:
     _show_error(window, ex)
     return
-  window["progress"].update(25)
   try:
     reserve_description, _ = populations.mod_diamonds(reserve_key, reserve_details, species_key, diamond_cnt, male_fur_keys, female_fur_keys)
   except Exception as ex:    
     _show_error(window, ex)
     return
-  window["progress"].update(50)
-  window["reserve_description"].update(_highlight_values(_format_reserve_description(reserve_description)))
-  window["progress"].update(75)
+  window["reserve_description"].update(populations.format_reserve_description(reserve_description))
   window["reserve_warning"].update(VIEW_MODDED)
   window["reserve_note"].update(f"{get_species_name(species_key).upper()} (Diamonds) {config.SAVED}: \"{MOD_DIR_PATH / get_population_file_name(reserve_key)}\"")
   window["progress"].update(100)
-  time.sleep(PROGRESS_DELAY)
   window["progress"].update(0)  
   window["show_animals"].update(disabled=True)
   window["update_animals"].update(disabled=True)
@@ -321,18 +300,14 @@ def _mod_animal(window: sg.Window, reserve_key: str, species_key: str, animal: A
   except Exception as ex:
     _show_error(window, ex)
     return
-  window["progress"].update(25)
   try:
     populations.mod_animal(reserve_details, species_key, adfAnimal, animal.go, animal.gender_key, animal.weight, animal.score, animal.fur_key(species_key))
   except Exception as ex:    
     _show_error(window, ex)
     return
-  window["progress"].update(50)
-  window["progress"].update(75)
   window["reserve_warning"].update(VIEW_MODDED)
   window["reserve_note"].update(f"{get_species_name(species_key).upper()} (Animal Update) {config.SAVED}: \"{MOD_DIR_PATH / get_population_file_name(reserve_key)}\"")
   window["progress"].update(100)
-  time.sleep(PROGRESS_DELAY)
   window["progress"].update(0)  
   _clear_animal_details(window)  
   _disable_animal_details(window, True)
@@ -347,19 +322,15 @@ def _mod(reserve_key: str, species: str, strategy: Strategy, window: sg.Window,
   except Exception as ex:
     _show_error(window, ex)
     return
-  window["progress"].update(25)
   try:
     reserve_description, _ = populations.mod(reserve_key, reserve_details, species, strategy.value, rares=rares, modifier=modifier, percentage=percentage)
   except Exception as ex:    
     _show_error(window, ex)
     return
-  window["progress"].update(50)
-  window["reserve_description"].update(_highlight_values(_format_reserve_description(reserve_description)))
-  window["progress"].update(75)
+  window["reserve_description"].update(populations.format_reserve_description(reserve_description))
   window["reserve_warning"].update(VIEW_MODDED)
   window["reserve_note"].update(f"{get_species_name(species).upper()} ({format_key(strategy)}) {config.SAVED}: \"{MOD_DIR_PATH / get_population_file_name(reserve_key)}\"")
   window["progress"].update(100)
-  time.sleep(PROGRESS_DELAY)
   window["progress"].update(0)  
   window["show_animals"].update(disabled=True)
   window["update_animals"].update(disabled=True)
@@ -413,7 +384,6 @@ def _load_mod(window: sg.Window, filename: Path) -> None:
       return    
     _progress(window, 100)
     sg.PopupQuickMessage(config.MOD_LOADED, font="_ 28", background_color="brown")
-    time.sleep(PROGRESS_DELAY)
   except Exception:
     print(traceback.format_exc())
     _show_warning(window, {config.FAILED_TO_LOAD_MOD})    
@@ -435,7 +405,6 @@ def _unload_mod(window: sg.Window, filename: Path) -> None:
     os.remove(backup_file)
     _progress(window, 100)
     sg.PopupQuickMessage(config.MOD_UNLOADED, font="_ 28", background_color="brown")
-    time.sleep(PROGRESS_DELAY)
   except Exception:
     print(traceback.format_exc())
     _show_warning(window, f"{config.FAILED_TO_UNLOAD_MOD}")    
@@ -453,16 +422,9 @@ def _process_list_mods(window: sg.Window, reserve_name: str = None) -> list:
       if mod[0] == reserve_name:
         window["mod_list"].update(select_rows=[mod_i])
   window["progress"].update(100)
-  time.sleep(PROGRESS_DELAY)
   window["progress"].update(0)
   return mods 
 
-def _format_reserve_description(reserve_description: List) -> List:
-  rows = []
-  for row in reserve_description:
-    rows.append(row[2:])
-  return rows
-
 def _reset_mod(window: sg.Window) -> None:
   window["gender_value"].update(0, range=(0,0))
   window["go_value"].update(0)
@@ -578,7 +540,6 @@ def _show_animals(window: sg.Window, values: dict, reserve_key: str, species: st
   window["species_description"].update(species_description)
   window["progress"].update(100)
   _show_species_description(window, reserve_key, species_name, is_modded, is_top)        
-  time.sleep(PROGRESS_DELAY)
   window["progress"].update(0)
   return species_description, animal_details
 
@@ -601,6 +562,8 @@ def _toggle_section_visible(window: sg.Window, section: str, visible: bool = Non
 def main_window(my_window: sg.Window = None) -> sg.Window:
     global reserve_names
     reserve_names = config.reserves()
+    global reserve_key_by_name
+    reserve_key_by_name = dict(zip(reserve_names, reserve_keys))
     global reserve_name_size
     reserve_name_size = len(max(reserve_names, key = len))
     reserve_name_size = 27 if reserve_name_size < 27 else reserve_name_size
@@ -857,9 +820,8 @@ def main() -> None:
           window["everyone_party"].update(disabled=False)
           window["fur_party"].update(disabled=False)
           window["progress"].update(90)
-          window["reserve_description"].update(_highlight_values(_format_reserve_description(reserve_description)))
+          window["reserve_description"].update(populations.format_reserve_description(reserve_description))
           window["progress"].update(100)
-          time.sleep(PROGRESS_DELAY)
           window["progress"].update(0)
           _disable_new_reserve(window)
         elif isinstance(event, tuple):